@@ -1,17 +1,43 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import Body, FastAPI, HTTPException, Header
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field
 import pandas as pd
 import numpy as np
 import pickle
-from typing import Literal, Optional
-from datetime import datetime
+import orjson
+import os
+import hashlib
+from typing import Annotated, Literal, Optional
+import time
 from math import radians, sin, cos, sqrt, atan2
-import requests
+from functools import lru_cache
+from contextlib import asynccontextmanager
+import asyncio
+import httpx
+from cachetools import TTLCache
+from starlette.concurrency import run_in_threadpool
+
+# Shared client so geocoding calls reuse connections without blocking the event loop;
+# created per lifespan so a restarted app never reuses a closed client
+http_client: Optional[httpx.AsyncClient] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global http_client
+    http_client = httpx.AsyncClient(timeout=10.0)
+    try:
+        yield
+    finally:
+        await http_client.aclose()
+
 
 app = FastAPI(
     title="Delivery Time Prediction API",
     description="ML-powered API with cooking + delivery time breakdown",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Load model artifact
@@ -27,38 +53,86 @@ try:
 except Exception as e:
     raise RuntimeError(f"❌ Failed to load model artifact: {e}")
 
+# Model input dtype; XGBoost predicts on float32, so building rows as float32 avoids a float64→float32 conversion copy
+FEATURE_DTYPE = np.float32
+
+# Run one prediction at startup so the first request doesn't pay one-time predict costs
+if os.environ.get("SKIP_WARMUP") != "1":
+    try:
+        model.predict(np.zeros((1, len(feature_columns)), dtype=FEATURE_DTYPE))
+        print(f"🔥 Model warmed up")
+    except Exception as e:
+        print(f"⚠️ Model warmup failed: {e}")
+
 
 # ============ HELPER FUNCTIONS ============
 
+EARTH_RADIUS_KM = 6371
+
+
+@lru_cache(maxsize=8192)
 def calculate_distance(lat1, lon1, lat2, lon2):
-    """Calculate distance between two points using Haversine formula"""
-    R = 6371  # Earth's radius in kilometers
+    """Calculate distance in km between two points using Haversine formula (memoized)"""
+    lat1 = radians(lat1)
+    lat2 = radians(lat2)
+    sin_dlat = sin((lat2 - lat1) * 0.5)
+    sin_dlon = sin((radians(lon2) - radians(lon1)) * 0.5)
     
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
+    a = sin_dlat * sin_dlat + cos(lat1) * cos(lat2) * sin_dlon * sin_dlon
+    return EARTH_RADIUS_KM * 2 * atan2(sqrt(a), sqrt(1 - a))
+
+
+def calculate_distance_vec(lat1, lon1, lat2, lon2):
+    """Vectorized calculate_distance over 1-D arrays of coordinates"""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(x, dtype=np.float64)) for x in (lat1, lon1, lat2, lon2))
     dlat = lat2 - lat1
     dlon = lon2 - lon1
     
-    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1-a))
-    distance = R * c
-    
-    return round(distance, 2)
+    a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
+    return EARTH_RADIUS_KM * c
+
+
+# (epoch second, formatted local time) of the most recent timestamp
+timestamp_cache = (0, "")
+
 
+def current_timestamp() -> str:
+    """Local time as "%Y-%m-%d %H:%M:%S", formatted at most once per second"""
+    global timestamp_cache
+    now = int(time.time())
+    second, formatted = timestamp_cache
+    if second != now:
+        formatted = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+        timestamp_cache = (now, formatted)
+    return formatted
 
-def geocode_address(address: str, api_key: str):
+
+# Recent geocoding results keyed by (normalized address, API key)
+geocode_cache = TTLCache(maxsize=10_000, ttl=86400)
+
+
+async def geocode_address(address: str, api_key: str):
     """Convert address to lat/long using OpenCage"""
+    key = (address.strip().lower(), api_key)
+    cached = geocode_cache.get(key)
+    if cached is not None:
+        return cached
+    
     try:
         url = f"https://api.opencagedata.com/geocode/v1/json"
         params = {"q": address, "key": api_key, "limit": 1}
-        response = requests.get(url, params=params, timeout=10)
+        response = await http_client.get(url, params=params)
         
         if response.status_code == 200:
             data = response.json()
             if data["results"]:
-                return {
+                coords = {
                     "latitude": data["results"][0]["geometry"]["lat"],
                     "longitude": data["results"][0]["geometry"]["lng"]
                 }
+                geocode_cache[key] = coords
+                return coords
         return None
     except Exception as e:
         raise HTTPException(500, f"Geocoding error: {str(e)}")
@@ -69,15 +143,17 @@ def geocode_address(address: str, api_key: str):
 class DeliveryRequest(BaseModel):
     """Complete delivery prediction request with time features"""
     
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     # Location coordinates
-    restaurant_latitude: float = Field(..., ge=-90, le=90, example=22.745049)
-    restaurant_longitude: float = Field(..., ge=-180, le=180, example=75.892471)
-    delivery_latitude: float = Field(..., ge=-90, le=90, example=22.765049)
-    delivery_longitude: float = Field(..., ge=-180, le=180, example=75.912471)
+    restaurant_latitude: float = Field(..., ge=-90, le=90, examples=[22.745049])
+    restaurant_longitude: float = Field(..., ge=-180, le=180, examples=[75.892471])
+    delivery_latitude: float = Field(..., ge=-90, le=90, examples=[22.765049])
+    delivery_longitude: float = Field(..., ge=-180, le=180, examples=[75.912471])
     
     # Delivery partner info
-    delivery_person_age: float = Field(..., ge=18, le=65, example=28)
-    delivery_person_ratings: float = Field(..., ge=1.0, le=5.0, example=4.5)
+    delivery_person_age: float = Field(..., ge=18, le=65, examples=[28])
+    delivery_person_ratings: float = Field(..., ge=1.0, le=5.0, examples=[4.5])
     
     # Order context
     weather_conditions: Literal["Sunny", "Stormy", "Cloudy", "Fog", "Sandstorms", "Windy"]
@@ -88,26 +164,28 @@ class DeliveryRequest(BaseModel):
     festival: Literal["Yes", "No"] = "No"
     
     # Time features (from Streamlit)
-    day: int = Field(..., ge=1, le=31, example=15)
-    month: int = Field(..., ge=1, le=12, example=12)
-    day_of_week: int = Field(..., ge=0, le=6, example=3)
-    is_weekend: int = Field(..., ge=0, le=1, example=0)
-    hour: int = Field(..., ge=0, le=23, example=18)
-    is_rush_hour: int = Field(..., ge=0, le=1, example=1)
+    day: int = Field(..., ge=1, le=31, examples=[15])
+    month: int = Field(..., ge=1, le=12, examples=[12])
+    day_of_week: int = Field(..., ge=0, le=6, examples=[3])
+    is_weekend: int = Field(..., ge=0, le=1, examples=[0])
+    hour: int = Field(..., ge=0, le=23, examples=[18])
+    is_rush_hour: int = Field(..., ge=0, le=1, examples=[1])
     
     # Optional with defaults
-    vehicle_condition: int = Field(2, ge=0, le=3, example=2)
-    multiple_deliveries: int = Field(0, ge=0, le=4, example=0)
-    order_prepare_time: float = Field(15.0, ge=0, le=180, example=15.0)
-    city_code: str = Field("INDO", min_length=3, max_length=4, example="INDO")
+    vehicle_condition: int = Field(2, ge=0, le=3, examples=[2])
+    multiple_deliveries: int = Field(0, ge=0, le=4, examples=[0])
+    order_prepare_time: float = Field(15.0, ge=0, le=180, examples=[15.0])
+    city_code: str = Field("INDO", min_length=3, max_length=4, examples=["INDO"])
 
 
 class AddressBasedRequest(BaseModel):
     """Address-based prediction request"""
     
+    model_config = ConfigDict(extra="ignore", frozen=True)
+    
     # Addresses
-    restaurant_address: str = Field(..., example="Vatika Business Park, Sector 49, Gurgaon")
-    delivery_address: str = Field(..., example="DLF Cyber City, Gurgaon")
+    restaurant_address: str = Field(..., examples=["Vatika Business Park, Sector 49, Gurgaon"])
+    delivery_address: str = Field(..., examples=["DLF Cyber City, Gurgaon"])
     opencage_api_key: str = Field(..., description="OpenCage API key for geocoding")
     
     # Delivery partner
@@ -139,7 +217,132 @@ class AddressBasedRequest(BaseModel):
 
 # ============ PREDICTION LOGIC ============
 
-def prepare_features_for_prediction(data: dict, distance: float) -> pd.DataFrame:
+# Column position of each model feature
+FEATURE_INDEX = {name: i for i, name in enumerate(feature_columns)}
+
+# Request field each training feature is read from
+REQUEST_FIELDS = {
+    "Delivery_person_Age": "delivery_person_age",
+    "Delivery_person_Ratings": "delivery_person_ratings",
+    "Restaurant_latitude": "restaurant_latitude",
+    "Restaurant_longitude": "restaurant_longitude",
+    "Delivery_location_latitude": "delivery_latitude",
+    "Delivery_location_longitude": "delivery_longitude",
+    "Weather_conditions": "weather_conditions",
+    "Road_traffic_density": "road_traffic_density",
+    "Vehicle_condition": "vehicle_condition",
+    "Type_of_order": "type_of_order",
+    "Type_of_vehicle": "type_of_vehicle",
+    "multiple_deliveries": "multiple_deliveries",
+    "Festival": "festival",
+    "City": "city",
+    "City_code": "city_code",
+    "order_prepare_time": "order_prepare_time",
+    "day": "day",
+    "month": "month",
+    "day_of_week": "day_of_week",
+    "is_weekend": "is_weekend",
+    "hour": "hour",
+    "is_rush_hour": "is_rush_hour"
+}
+
+
+def build_category_lookup() -> dict:
+    """
+    Encode every known category once so requests can look up encoded values
+    instead of calling the encoder
+    """
+    cat_cols = list(encoder.feature_names_in_)
+    n_rows = max(len(cats) for cats in encoder.categories_)
+    
+    # One frame holding every category of every column (shorter columns padded)
+    frame = pd.DataFrame({
+        col: [cats[min(i, len(cats) - 1)] for i in range(n_rows)]
+        for col, cats in zip(cat_cols, encoder.categories_)
+    })
+    encoded = encoder.transform(frame)
+    
+    return {
+        col: {cats[i]: float(encoded[i, j]) for i in range(len(cats))}
+        for j, (col, cats) in enumerate(zip(cat_cols, encoder.categories_))
+    }
+
+
+CATEGORY_LOOKUP = build_category_lookup()
+
+# Encoded value for categories unseen in training (None when the encoder rejects them)
+UNKNOWN_CATEGORY_VALUE = (
+    float(encoder.unknown_value)
+    if getattr(encoder, "handle_unknown", "error") == "use_encoded_value"
+    else None
+)
+
+# (column position, request field) for numeric and categorical model inputs
+NUMERIC_SLOTS = [
+    (FEATURE_INDEX[name], field)
+    for name, field in REQUEST_FIELDS.items()
+    if name in FEATURE_INDEX and name not in CATEGORY_LOOKUP
+]
+CATEGORICAL_SLOTS = [
+    (FEATURE_INDEX[name], REQUEST_FIELDS[name], name)
+    for name in CATEGORY_LOOKUP
+    if name in FEATURE_INDEX
+]
+
+# Positions of the features derived per request (None if the model doesn't use them)
+DISTANCE_INDEX = FEATURE_INDEX.get("distance")
+AVG_SPEED_INDEX = FEATURE_INDEX.get("avg_speed_kmh")
+
+# Every model column must be filled from the request or a derived value
+unsourced_features = set(feature_columns) - set(REQUEST_FIELDS) - {"distance", "avg_speed_kmh"}
+if unsourced_features:
+    raise RuntimeError(f"❌ No source for model features: {sorted(unsourced_features)}")
+
+
+def encode_category(column: str, field: str, value: str) -> float:
+    """Look up the encoded value of a category, rejecting ones the encoder can't handle"""
+    encoded = CATEGORY_LOOKUP[column].get(value, UNKNOWN_CATEGORY_VALUE)
+    if encoded is None:
+        raise HTTPException(400, f"Unknown value for {field}: {value}")
+    return encoded
+
+
+ZERO_DISTANCE_ERROR = "Invalid coordinates - distance is zero"
+
+
+def distance_error(distance: float) -> Optional[str]:
+    """Reason a delivery distance can't be predicted, or None if it is valid"""
+    if distance > 100:
+        return f"Distance too large ({distance:.2f} km). Maximum 100km for delivery."
+    if distance <= 0:
+        return ZERO_DISTANCE_ERROR
+    return None
+
+
+# The zero-distance error is constant, so serialize it once
+ZERO_DISTANCE_BODY = orjson.dumps({"detail": ZERO_DISTANCE_ERROR})
+
+
+def checked_distance(data: dict) -> tuple[float, Optional[Response]]:
+    """
+    Delivery distance for a request, plus a 400 response to return directly
+    (instead of raising HTTPException) when it can't be predicted
+    """
+    distance = calculate_distance(
+        data["restaurant_latitude"],
+        data["restaurant_longitude"],
+        data["delivery_latitude"],
+        data["delivery_longitude"]
+    )
+    error = distance_error(distance)
+    if error is ZERO_DISTANCE_ERROR:
+        return distance, Response(content=ZERO_DISTANCE_BODY, status_code=400, media_type="application/json")
+    if error:
+        return distance, ORJSONResponse({"detail": error}, status_code=400)
+    return distance, None
+
+
+def prepare_features_for_prediction(data: dict, distance: float) -> np.ndarray:
     """
     Prepare all features including derived ones for prediction
     """
@@ -148,76 +351,135 @@ def prepare_features_for_prediction(data: dict, distance: float) -> pd.DataFrame
     estimated_delivery_time = max(data["order_prepare_time"] * 0.6, 10)  # Rough estimate
     avg_speed_kmh = (distance / estimated_delivery_time) * 60 if estimated_delivery_time > 0 else 20
     
-    # Build complete feature dictionary matching training data
-    features = {
-        "Delivery_person_Age": data["delivery_person_age"],
-        "Delivery_person_Ratings": data["delivery_person_ratings"],
-        "Restaurant_latitude": data["restaurant_latitude"],
-        "Restaurant_longitude": data["restaurant_longitude"],
-        "Delivery_location_latitude": data["delivery_latitude"],
-        "Delivery_location_longitude": data["delivery_longitude"],
-        "Weather_conditions": data["weather_conditions"],
-        "Road_traffic_density": data["road_traffic_density"],
-        "Vehicle_condition": data["vehicle_condition"],
-        "Type_of_order": data["type_of_order"],
-        "Type_of_vehicle": data["type_of_vehicle"],
-        "multiple_deliveries": data["multiple_deliveries"],
-        "Festival": data["festival"],
-        "City": data["city"],
-        "City_code": data["city_code"],
-        "order_prepare_time": data["order_prepare_time"],
-        "distance": distance,
-        "day": data["day"],
-        "month": data["month"],
-        "day_of_week": data["day_of_week"],
-        "is_weekend": data["is_weekend"],
-        "hour": data["hour"],
-        "is_rush_hour": data["is_rush_hour"],
-        "avg_speed_kmh": avg_speed_kmh
-    }
+    # Single row in training column order; every column is written below
+    row = np.empty((1, len(feature_columns)), dtype=FEATURE_DTYPE)
     
-    # Convert to DataFrame
-    input_df = pd.DataFrame([features])
+    for idx, field in NUMERIC_SLOTS:
+        row[0, idx] = data[field]
     
     # Encode categorical columns
-    cat_cols = encoder.feature_names_in_
-    input_df[cat_cols] = encoder.transform(input_df[cat_cols])
+    for idx, field, column in CATEGORICAL_SLOTS:
+        row[0, idx] = encode_category(column, field, data[field])
+    
+    if DISTANCE_INDEX is not None:
+        row[0, DISTANCE_INDEX] = distance
+    if AVG_SPEED_INDEX is not None:
+        row[0, AVG_SPEED_INDEX] = avg_speed_kmh
+    
+    return row
+
+
+def prepare_feature_matrix(records: list, distances: np.ndarray) -> np.ndarray:
+    """
+    Batch version of prepare_features_for_prediction: one row per request
+    """
+    prep_times = np.array([data["order_prepare_time"] for data in records], dtype=np.float64)
+    estimated_delivery_times = np.maximum(prep_times * 0.6, 10)
     
-    # Ensure all features are present and in correct order
-    for col in feature_columns:
-        if col not in input_df.columns:
-            input_df[col] = 0
+    matrix = np.empty((len(records), len(feature_columns)), dtype=FEATURE_DTYPE)
+    
+    for idx, field in NUMERIC_SLOTS:
+        matrix[:, idx] = [data[field] for data in records]
+    
+    for idx, field, column in CATEGORICAL_SLOTS:
+        matrix[:, idx] = [encode_category(column, field, data[field]) for data in records]
+    
+    if DISTANCE_INDEX is not None:
+        matrix[:, DISTANCE_INDEX] = distances
+    if AVG_SPEED_INDEX is not None:
+        matrix[:, AVG_SPEED_INDEX] = distances / estimated_delivery_times * 60
+    
+    return matrix
+
+
+def build_prediction_response(data: dict, distance: float, predicted_time: float) -> dict:
+    """
+    Build the response body for one clipped model prediction
+    """
+    # Calculate breakdown
+    prep_time = data["order_prepare_time"]
+    # estimated_delivery_time = max(predicted_time - prep_time, 5) + 20
+    estimated_delivery_time = predicted_time + prep_time
+    avg_speed = (distance / estimated_delivery_time) * 60 if estimated_delivery_time > 0 else 0
     
-    # Reorder to match training
-    input_df = input_df[feature_columns]
+    return {
+        "success": True,
+        "predicted_delivery_time_minutes": predicted_time + 20,
+        "calculated_distance_km": distance,
+        "breakdown": {
+            "preparation_time_minutes": prep_time,
+            "estimated_delivery_time_minutes": estimated_delivery_time,
+            "average_speed_kmh": avg_speed
+        },
+        "conditions": {
+            "weather": data["weather_conditions"],
+            "traffic": data["road_traffic_density"],
+            "is_rush_hour": bool(data["is_rush_hour"]),
+            "is_weekend": bool(data["is_weekend"]),
+            "festival": data["festival"],
+            "order_type": data["type_of_order"]
+        },
+        "order_date": current_timestamp()
+    }
+
+
+def run_prediction(data: dict, distance: float) -> dict:
+    """
+    Run the coordinate-based prediction on validated request fields and an
+    already validated distance, and build the response body
+    """
     
-    return input_df
+    try:
+        # Prepare features
+        features = prepare_features_for_prediction(data, distance)
+        
+        # Make prediction (model was trained without log transform in improved version)
+        prediction = model.predict(features)[0]
+        
+        # Clip to reasonable range (5-120 minutes)
+        predicted_time = float(np.clip(prediction, 5, 120))
+        
+        return build_prediction_response(data, distance, predicted_time)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Prediction failed: {str(e)}"
+        )
 
 
 # ============ API ENDPOINTS ============
 
+# Health responses only depend on the loaded artifact, so serialize them once
+ROOT_BODY = orjson.dumps({
+    "status": "running",
+    "version": "2.0.0",
+    "model_loaded": True,
+    "features_count": len(feature_columns),
+    "message": "Delivery Time Prediction API with cooking + delivery breakdown"
+})
+
+HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "model_loaded": model is not None,
+    "encoder_loaded": encoder is not None,
+    "feature_count": len(feature_columns),
+    "expected_features": feature_columns
+})
+
+
 @app.get("/", tags=["Health"])
 def health_check():
     """API health check"""
-    return {
-        "status": "running",
-        "version": "2.0.0",
-        "model_loaded": True,
-        "features_count": len(feature_columns),
-        "message": "Delivery Time Prediction API with cooking + delivery breakdown"
-    }
+    return Response(content=ROOT_BODY, media_type="application/json")
 
 
 @app.get("/health", tags=["Health"])
 def detailed_health():
     """Detailed health information"""
-    return {
-        "status": "healthy",
-        "model_loaded": model is not None,
-        "encoder_loaded": encoder is not None,
-        "feature_count": len(feature_columns),
-        "expected_features": feature_columns
-    }
+    return Response(content=HEALTH_BODY, media_type="application/json")
 
 
 @app.post("/predict", tags=["Prediction"])
@@ -227,140 +489,95 @@ def predict_delivery_time(request: DeliveryRequest):
     Returns total time = cooking time + delivery time
     """
     
+    # Calculate and validate distance
+    data = request.model_dump()
+    distance, error_response = checked_distance(data)
+    if error_response:
+        return error_response
+    
+    return ORJSONResponse(run_prediction(data, distance))
+
+
+# Largest batch accepted by /predict-batch; bigger ones are rejected with 422
+MAX_BATCH_SIZE = 1000
+
+
+@app.post("/predict-batch", tags=["Prediction"])
+def predict_batch(batch: Annotated[list[DeliveryRequest], Body(max_length=MAX_BATCH_SIZE)]):
+    """
+    Predict delivery times for many coordinate-based requests at once
+    using a single model call
+    """
+    
     try:
-        # Calculate distance
-        distance = calculate_distance(
-            request.restaurant_latitude,
-            request.restaurant_longitude,
-            request.delivery_latitude,
-            request.delivery_longitude
-        )
-        
-        # Validate distance
-        if distance > 100:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Distance too large ({distance:.2f} km). Maximum 100km for delivery."
-            )
+        records = [request.model_dump() for request in batch]
+        if not records:
+            return ORJSONResponse({"success": True, "count": 0, "predictions": []})
         
-        if distance <= 0:
-            raise HTTPException(status_code=400, detail="Invalid coordinates - distance is zero")
-        
-        # Prepare request data
-        data = {
-            "restaurant_latitude": request.restaurant_latitude,
-            "restaurant_longitude": request.restaurant_longitude,
-            "delivery_latitude": request.delivery_latitude,
-            "delivery_longitude": request.delivery_longitude,
-            "delivery_person_age": request.delivery_person_age,
-            "delivery_person_ratings": request.delivery_person_ratings,
-            "weather_conditions": request.weather_conditions,
-            "road_traffic_density": request.road_traffic_density,
-            "type_of_order": request.type_of_order,
-            "type_of_vehicle": request.type_of_vehicle,
-            "city": request.city,
-            "festival": request.festival,
-            "vehicle_condition": request.vehicle_condition,
-            "multiple_deliveries": request.multiple_deliveries,
-            "order_prepare_time": request.order_prepare_time,
-            "city_code": request.city_code,
-            "day": request.day,
-            "month": request.month,
-            "day_of_week": request.day_of_week,
-            "is_weekend": request.is_weekend,
-            "hour": request.hour,
-            "is_rush_hour": request.is_rush_hour
-        }
-        
-        # Prepare features
-        input_df = prepare_features_for_prediction(data, distance)
-        
-        # Make prediction (model was trained without log transform in improved version)
-        prediction = model.predict(input_df)[0]
+        # Calculate all distances in one vectorized pass
+        distances = calculate_distance_vec(
+            [data["restaurant_latitude"] for data in records],
+            [data["restaurant_longitude"] for data in records],
+            [data["delivery_latitude"] for data in records],
+            [data["delivery_longitude"] for data in records]
+        )
         
-        # Clip to reasonable range (5-120 minutes)
-        predicted_time = float(np.clip(prediction, 5, 120))
+        # Validate distances
+        for i, distance in enumerate(distances):
+            error = distance_error(distance)
+            if error:
+                return ORJSONResponse({"detail": f"Request {i}: {error}"}, status_code=400)
         
-        # Calculate breakdown
-        prep_time = request.order_prepare_time
-        # estimated_delivery_time = max(predicted_time - prep_time, 5) + 20
-        estimated_delivery_time = predicted_time + prep_time
-        avg_speed = (distance / estimated_delivery_time) * 60 if estimated_delivery_time > 0 else 0
+        # Predict the whole batch, clipped to 5-120 minutes
+        features = prepare_feature_matrix(records, distances)
+        predicted_times = np.clip(model.predict(features), 5, 120)
         
-        return {
-            "success": True,
-            "predicted_delivery_time_minutes": round(predicted_time + 20, 2),
-            "calculated_distance_km": distance,
-            "breakdown": {
-                "preparation_time_minutes": round(prep_time, 2),
-                "estimated_delivery_time_minutes": round(estimated_delivery_time, 2),
-                "average_speed_kmh": round(avg_speed, 2)
-            },
-            "conditions": {
-                "weather": request.weather_conditions,
-                "traffic": request.road_traffic_density,
-                "is_rush_hour": bool(request.is_rush_hour),
-                "is_weekend": bool(request.is_weekend),
-                "festival": request.festival,
-                "order_type": request.type_of_order
-            },
-            "order_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+        predictions = [
+            build_prediction_response(data, float(distance), float(predicted_time))
+            for data, distance, predicted_time in zip(records, distances, predicted_times)
+        ]
+        return ORJSONResponse({"success": True, "count": len(predictions), "predictions": predictions})
         
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Prediction failed: {str(e)}"
+            detail=f"Batch prediction failed: {str(e)}"
         )
 
 
 @app.post("/predict-with-address", tags=["Prediction"])
-def predict_with_addresses(request: AddressBasedRequest):
+async def predict_with_addresses(request: AddressBasedRequest):
     """
     Predict delivery time using addresses instead of coordinates
     """
     
     try:
-        # Geocode restaurant address
-        rest_coords = geocode_address(request.restaurant_address, request.opencage_api_key)
+        # Geocode restaurant and delivery addresses concurrently
+        rest_coords, del_coords = await asyncio.gather(
+            geocode_address(request.restaurant_address, request.opencage_api_key),
+            geocode_address(request.delivery_address, request.opencage_api_key)
+        )
         if not rest_coords:
             raise HTTPException(400, "Failed to geocode restaurant address")
-        
-        # Geocode delivery address
-        del_coords = geocode_address(request.delivery_address, request.opencage_api_key)
         if not del_coords:
             raise HTTPException(400, "Failed to geocode delivery address")
         
-        # Create coordinate-based request
-        coord_request = DeliveryRequest(
-            restaurant_latitude=rest_coords["latitude"],
-            restaurant_longitude=rest_coords["longitude"],
-            delivery_latitude=del_coords["latitude"],
-            delivery_longitude=del_coords["longitude"],
-            delivery_person_age=request.delivery_person_age,
-            delivery_person_ratings=request.delivery_person_ratings,
-            weather_conditions=request.weather_conditions,
-            road_traffic_density=request.road_traffic_density,
-            type_of_order=request.type_of_order,
-            type_of_vehicle=request.type_of_vehicle,
-            city=request.city,
-            festival=request.festival,
-            vehicle_condition=request.vehicle_condition,
-            multiple_deliveries=request.multiple_deliveries,
-            order_prepare_time=request.order_prepare_time,
-            city_code=request.city_code,
-            day=request.day,
-            month=request.month,
-            day_of_week=request.day_of_week,
-            is_weekend=request.is_weekend,
-            hour=request.hour,
-            is_rush_hour=request.is_rush_hour
-        )
+        # Reuse the validated fields with the geocoded coordinates
+        data = request.model_dump(exclude={"restaurant_address", "delivery_address", "opencage_api_key"})
+        data["restaurant_latitude"] = rest_coords["latitude"]
+        data["restaurant_longitude"] = rest_coords["longitude"]
+        data["delivery_latitude"] = del_coords["latitude"]
+        data["delivery_longitude"] = del_coords["longitude"]
+        
+        # Calculate and validate distance
+        distance, error_response = checked_distance(data)
+        if error_response:
+            return error_response
         
-        # Use existing prediction endpoint
-        result = predict_delivery_time(coord_request)
+        # Model inference is CPU-bound; keep it off the event loop
+        result = await run_in_threadpool(run_prediction, data, distance)
         
         # Add geocoded coordinates to response
         result["geocoded_coordinates"] = {
@@ -368,7 +585,7 @@ def predict_with_addresses(request: AddressBasedRequest):
             "delivery": del_coords
         }
         
-        return result
+        return ORJSONResponse(result)
         
     except HTTPException:
         raise
@@ -376,26 +593,71 @@ def predict_with_addresses(request: AddressBasedRequest):
         raise HTTPException(500, f"Address-based prediction failed: {str(e)}")
 
 
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """Whether an If-None-Match header (comma-separated, weak or strong) lists the ETag"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+@app.get("/geocode", tags=["Utilities"])
+async def geocode_get(address: str, api_key: str, if_none_match: Optional[str] = Header(None)):
+    """
+    Cacheable variant of /geocode; coordinates are stable, so clients can
+    revalidate with the ETag. Private only, since the API key is in the URL
+    """
+    
+    result = await geocode_address(address, api_key)
+    if not result:
+        raise HTTPException(400, "Geocoding failed - check address and API key")
+    
+    body = orjson.dumps(result)
+    headers = {
+        "ETag": f'"{hashlib.md5(body).hexdigest()}"',
+        "Cache-Control": "private, max-age=86400"
+    }
+    if etag_matches(headers["ETag"], if_none_match):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.post("/geocode", tags=["Utilities"])
-def geocode_endpoint(address: str, api_key: str):
+async def geocode_endpoint(address: str, api_key: str):
     """Utility endpoint to convert address to coordinates"""
     
-    result = geocode_address(address, api_key)
+    result = await geocode_address(address, api_key)
     if result:
         return result
     else:
         raise HTTPException(400, "Geocoding failed - check address and API key")
 
 
+# Compress larger responses (e.g. batch predictions)
+from fastapi.middleware.gzip import GZipMiddleware
+
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # CORS middleware for frontend integration
 from fastapi.middleware.cors import CORSMiddleware
 
+# Comma-separated allowed origins; defaults to the local Streamlit frontend
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.environ.get("CORS_ORIGINS", "http://localhost:8501").split(",")
+    if origin.strip()
+]
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, replace with specific origins
+    allow_origins=CORS_ORIGINS,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    max_age=86400,
 )
 
 